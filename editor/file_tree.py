@@ -5,16 +5,18 @@ Implements a VS Code-style file tree sidebar for browsing and opening files.
 """
 
 import os
-from pathlib import Path
+import stat
 from typing import Optional
 
 from PySide6.QtWidgets import (
-    QTreeView, QWidget, QVBoxLayout, QHBoxLayout, QHeaderView,
-    QFileDialog, QToolBar, QStyle, QFileSystemModel, QToolButton,
+    QApplication, QTreeView, QWidget, QVBoxLayout, QHBoxLayout, QHeaderView,
+    QFileDialog, QToolBar, QStyle, QToolButton,
     QLabel, QFrame, QSizePolicy
 )
 from PySide6.QtGui import QAction, QMouseEvent
-from PySide6.QtCore import Signal, Qt, QModelIndex, QDir
+from PySide6.QtCore import Signal, Qt, QModelIndex, QFileSystemWatcher, QTimer
+
+from editor.file_tree_model import FileTreeModel
 
 
 class SidebarExpandButton(QToolButton):
@@ -34,13 +36,15 @@ class CollapsibleSidebar(QWidget):
     A sidebar container that fully collapses, leaving only an expand button.
     
     Signals:
-        collapsed_changed: Emitted when collapsed state changes.
+        collapsed_changed: Emitted when collapsed state changes. Rapid toggles
+            within one event loop pass are coalesced into a single emission
+            of the final state.
     """
     
     collapsed_changed = Signal(bool)
     
+    COLLAPSED_WIDTH = 16
     EXPANDED_MIN_WIDTH = 150
-    EXPANDED_MAX_WIDTH = 400
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -48,6 +52,9 @@ class CollapsibleSidebar(QWidget):
         self._collapsed = False
         self._content_widget: Optional[QWidget] = None
         self._expanded_width = 200
+        self._applied_width: Optional[int] = None
+        self._emitted_collapsed = False
+        self._collapsed_signal_pending = False
         
         self._setup_ui()
     
@@ -120,7 +127,17 @@ class CollapsibleSidebar(QWidget):
         
         self._collapsed = collapsed
         self._update_collapsed_state()
-        self.collapsed_changed.emit(collapsed)
+        
+        if not self._collapsed_signal_pending:
+            self._collapsed_signal_pending = True
+            QTimer.singleShot(0, self, self._flush_collapsed_signal)
+    
+    def _flush_collapsed_signal(self):
+        """Emit collapsed_changed once for the final state of a burst of toggles."""
+        self._collapsed_signal_pending = False
+        if self._collapsed != self._emitted_collapsed:
+            self._emitted_collapsed = self._collapsed
+            self.collapsed_changed.emit(self._collapsed)
     
     def toggle_collapsed(self):
         """Toggle the collapsed state."""
@@ -142,13 +159,19 @@ class CollapsibleSidebar(QWidget):
         self._update_size_constraints()
     
     def _update_size_constraints(self):
-        """Update size constraints based on collapsed state."""
-        if self._collapsed:
-            self.setFixedWidth(16)
-        else:
-            self.setMinimumWidth(self.EXPANDED_MIN_WIDTH)
-            self.setMaximumWidth(self.EXPANDED_MAX_WIDTH)
-            self.setFixedWidth(self._expanded_width)
+        """
+        Update size constraints based on collapsed state.
+        
+        setFixedWidth sets both the minimum and maximum width, so it is the
+        only call needed, and it is skipped when the width is unchanged to
+        avoid a geometry update up the parent chain.
+        """
+        width = self.COLLAPSED_WIDTH if self._collapsed else self._expanded_width
+        if width == self._applied_width:
+            return
+        
+        self._applied_width = width
+        self.setFixedWidth(width)
 
 
 class FileTree(QWidget):
@@ -163,6 +186,8 @@ class FileTree(QWidget):
     file_open_requested = Signal(str)  # file path
     file_open_new_tab_requested = Signal(str)  # file path
     
+    _std_icon_cache: dict = {}
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         
@@ -171,6 +196,19 @@ class FileTree(QWidget):
         self._setup_ui()
         self._connect_signals()
     
+    @classmethod
+    def _std_icons(cls) -> dict:
+        """Get the toolbar's standard icons, created once per process."""
+        if not cls._std_icon_cache:
+            style = QApplication.style()
+            for pixmap in (
+                QStyle.StandardPixmap.SP_DirOpenIcon,
+                QStyle.StandardPixmap.SP_BrowserReload,
+                QStyle.StandardPixmap.SP_DialogCloseButton,
+            ):
+                cls._std_icon_cache[pixmap] = style.standardIcon(pixmap)
+        return cls._std_icon_cache
+    
     def _setup_ui(self):
         """Initialize UI components."""
         layout = QVBoxLayout(self)
@@ -181,22 +219,22 @@ class FileTree(QWidget):
         self._toolbar.setMovable(False)
         self._toolbar.setIconSize(self._toolbar.iconSize() * 0.8)
         
-        style = self.style()
+        icons = self._std_icons()
         
         self._open_folder_action = QAction("Open Folder", self)
-        self._open_folder_action.setIcon(style.standardIcon(QStyle.StandardPixmap.SP_DirOpenIcon))
+        self._open_folder_action.setIcon(icons[QStyle.StandardPixmap.SP_DirOpenIcon])
         self._open_folder_action.setToolTip("Open Folder")
         self._open_folder_action.triggered.connect(self._on_open_folder)
         self._toolbar.addAction(self._open_folder_action)
         
         self._refresh_action = QAction("Refresh", self)
-        self._refresh_action.setIcon(style.standardIcon(QStyle.StandardPixmap.SP_BrowserReload))
+        self._refresh_action.setIcon(icons[QStyle.StandardPixmap.SP_BrowserReload])
         self._refresh_action.setToolTip("Refresh")
         self._refresh_action.triggered.connect(self._on_refresh)
         self._toolbar.addAction(self._refresh_action)
         
         self._close_folder_action = QAction("Close Folder", self)
-        self._close_folder_action.setIcon(style.standardIcon(QStyle.StandardPixmap.SP_DialogCloseButton))
+        self._close_folder_action.setIcon(icons[QStyle.StandardPixmap.SP_DialogCloseButton])
         self._close_folder_action.setToolTip("Close Folder")
         self._close_folder_action.triggered.connect(self._on_close_folder)
         self._close_folder_action.setEnabled(False)
@@ -204,24 +242,17 @@ class FileTree(QWidget):
         
         layout.addWidget(self._toolbar)
         
-        self._model = QFileSystemModel(self)
-        self._model.setRootPath("")
-        self._model.setFilter(QDir.Filter.AllEntries | QDir.Filter.NoDotAndDotDot)
+        self._model = FileTreeModel(self)
+        self._watcher = QFileSystemWatcher(self)
         
         self._tree_view = FileTreeView(self)
         self._tree_view.setModel(self._model)
         self._tree_view.setHeaderHidden(True)
         self._tree_view.setAnimated(True)
         self._tree_view.setIndentation(16)
-        self._tree_view.setSortingEnabled(True)
-        self._tree_view.sortByColumn(0, Qt.SortOrder.AscendingOrder)
+        self._tree_view.setUniformRowHeights(True)
         
-        for i in range(1, self._model.columnCount()):
-            self._tree_view.hideColumn(i)
-        
-        header = self._tree_view.header()
-        header.setStretchLastSection(True)
-        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self._tree_view.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
         
         layout.addWidget(self._tree_view)
     
@@ -229,6 +260,9 @@ class FileTree(QWidget):
         """Connect signals."""
         self._tree_view.doubleClicked.connect(self._on_item_double_clicked)
         self._tree_view.middle_clicked.connect(self._on_item_middle_clicked)
+        self._tree_view.expanded.connect(self._on_item_expanded)
+        self._tree_view.collapsed.connect(self._on_item_collapsed)
+        self._watcher.directoryChanged.connect(self._model.refresh_directory)
     
     @property
     def root_path(self) -> Optional[str]:
@@ -237,31 +271,37 @@ class FileTree(QWidget):
     
     def open_folder(self, folder_path: str) -> bool:
         """Open a folder in the file tree."""
-        path = Path(folder_path)
-        if not path.exists() or not path.is_dir():
+        try:
+            st = os.stat(folder_path)
+        except OSError:
+            return False
+        if not stat.S_ISDIR(st.st_mode):
             return False
         
-        self._root_path = str(path.resolve())
-        self._model.setRootPath(self._root_path)
-        self._tree_view.setRootIndex(self._model.index(self._root_path))
+        self._root_path = os.path.realpath(folder_path)
+        self._set_model_root(self._root_path)
         self._close_folder_action.setEnabled(True)
         return True
     
     def close_folder(self):
         """Close the currently open folder."""
         self._root_path = None
-        home_dir = os.path.expanduser("~")
-        self._model.setRootPath(home_dir)
-        self._tree_view.setRootIndex(self._model.index(home_dir))
+        self._set_model_root(os.path.expanduser("~"))
         self._close_folder_action.setEnabled(False)
     
+    def _set_model_root(self, path: str):
+        """Show a folder in the tree and watch it for changes."""
+        watched = self._watcher.directories()
+        if watched:
+            self._watcher.removePaths(watched)
+        self._model.setRootPath(path)
+        self._tree_view.setRootIndex(self._model.index(path))
+        self._watcher.addPath(path)
+    
     def refresh(self):
-        """Refresh the file tree."""
+        """Refresh the file tree, updating only the entries that changed."""
         if self._root_path:
-            current_root = self._root_path
-            self._model.setRootPath("")
-            self._model.setRootPath(current_root)
-            self._tree_view.setRootIndex(self._model.index(current_root))
+            self._model.refresh_all()
     
     def _on_open_folder(self):
         """Handle open folder action."""
@@ -283,13 +323,23 @@ class FileTree(QWidget):
         """Handle close folder action."""
         self.close_folder()
     
+    def _on_item_expanded(self, index: QModelIndex):
+        """Watch an expanded folder and bring it up to date."""
+        path = self._model.filePath(index)
+        self._watcher.addPath(path)
+        self._model.refresh_directory(path)
+    
+    def _on_item_collapsed(self, index: QModelIndex):
+        """Stop watching a collapsed folder."""
+        self._watcher.removePath(self._model.filePath(index))
+    
     def _on_item_double_clicked(self, index: QModelIndex):
         """Handle double-click on an item."""
         if not index.isValid():
             return
         
         file_path = self._model.filePath(index)
-        if self._model.isDir(index):
+        if not file_path or self._model.isDir(index):
             return
         
         self.file_open_requested.emit(file_path)
@@ -300,7 +350,7 @@ class FileTree(QWidget):
             return
         
         file_path = self._model.filePath(index)
-        if self._model.isDir(index):
+        if not file_path or self._model.isDir(index):
             return
         
         self.file_open_new_tab_requested.emit(file_path)
@@ -319,7 +369,7 @@ class FileTreeView(QTreeView):
     def mousePressEvent(self, event: QMouseEvent):
         """Handle mouse press events."""
         if event.button() == Qt.MouseButton.MiddleButton:
-            index = self.indexAt(event.pos())
+            index = self.indexAt(event.position().toPoint())
             if index.isValid():
                 self.middle_clicked.emit(index)
                 event.accept()
@@ -0,0 +1,673 @@
+"""
+File Tree Model
+
+Lazy directory model backing the file tree sidebar.
+
+Directories are listed with os.scandir only when the view first asks for
+their children, so opening a large or remote folder does not stat every
+entry up front the way QFileSystemModel does. Listings run on the global
+QThreadPool and are handed back to the GUI thread through a queued signal,
+with a "Loading…" placeholder row shown in the meantime.
+"""
+
+import bisect
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from PySide6.QtWidgets import QFileIconProvider
+from PySide6.QtGui import QIcon
+from PySide6.QtCore import (
+    QAbstractItemModel, QFileInfo, QMimeDatabase, QModelIndex, QObject,
+    QRunnable, QThreadPool, Qt, Signal
+)
+
+
+LOADING_TEXT = "Loading…"
+
+
+class FileTreeNode:
+    """
+    A single file or directory entry in the file tree model.
+
+    Nodes store only their own name; full paths are rebuilt from the parent
+    chain on demand so a large tree does not hold one copy of every shared
+    path prefix. The root node's name is the folder's full path.
+    """
+
+    __slots__ = (
+        "name", "is_dir", "parent", "children", "loaded",
+        "placeholder", "icon", "icon_requested", "_sort_key",
+    )
+
+    def __init__(self, name: str, is_dir: bool, parent: Optional["FileTreeNode"] = None):
+        self.name = name
+        self.is_dir = is_dir
+        self._sort_key = _entry_sort_key(name, is_dir)
+        self.parent = parent
+        self.children: list["FileTreeNode"] = []
+        self.loaded = False
+        self.placeholder = False
+        self.icon: Optional[QIcon] = None
+        self.icon_requested = False
+
+    @classmethod
+    def loading_placeholder(cls, parent: "FileTreeNode") -> "FileTreeNode":
+        """Create the row shown under a folder while it is being listed."""
+        node = cls(LOADING_TEXT, False, parent)
+        node.placeholder = True
+        return node
+
+    def path(self) -> str:
+        """Get the full path of this entry, empty for the placeholder."""
+        if self.placeholder:
+            return ""
+        parts = []
+        node = self
+        while node.parent is not None:
+            parts.append(node.name)
+            node = node.parent
+        return os.path.join(node.name, *reversed(parts))
+
+    @property
+    def loading(self) -> bool:
+        """Check whether this folder is still showing its placeholder row."""
+        return bool(self.children) and self.children[0].placeholder
+
+    def sort_key(self) -> tuple[bool, str, str]:
+        """
+        Get the key ordering this node among its siblings.
+
+        The key is computed once per node: row() runs for every parent()
+        call the view makes, and each of its binary-search steps compares
+        against a sibling's key.
+        """
+        return self._sort_key
+
+    def child(self, name: str) -> Optional["FileTreeNode"]:
+        """Find a loaded child by name with a binary search of the sorted children."""
+        for is_dir in (True, False):
+            row = self._bisect(_entry_sort_key(name, is_dir))
+            if row < len(self.children) and self.children[row].name == name:
+                child = self.children[row]
+                if child.is_dir == is_dir and not child.placeholder:
+                    return child
+        return None
+
+    def row(self) -> int:
+        """Get this node's row within its parent."""
+        if self.parent is None:
+            return 0
+        return self.parent._bisect(self.sort_key())
+
+    def _bisect(self, key: tuple[bool, str, str]) -> int:
+        """Get the row where a child with the given sort key is, or would be."""
+        if self.loading:
+            return 0
+        return bisect.bisect_left(self.children, key, key=FileTreeNode.sort_key)
+
+
+def _entry_sort_key(name: str, is_dir: bool) -> tuple[bool, str, str]:
+    """Order folders first, then case-insensitively by name."""
+    return (not is_dir, name.casefold(), name)
+
+
+def _entry_is_dir(entry: os.DirEntry) -> bool:
+    """Check whether a scandir entry is a folder, following symlinks when possible."""
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def scan_directory(path: str) -> list[tuple[str, bool]]:
+    """
+    List a directory as sorted (name, is_dir) pairs.
+
+    Folders come first, then files, each ordered case-insensitively. Hidden
+    dot-entries are skipped in the scan loop itself (scandir never yields
+    "." or ".."), replacing QFileSystemModel's separate QDir filter pass.
+    Unreadable directories yield an empty list, while an entry whose type
+    cannot be resolved (a symlink loop or an unreadable link target) is
+    still listed, as a file.
+
+    Entry types come from the d_type filled in by getdents, so a listing is
+    one open plus a few getdents calls with no per-entry stat. There is
+    nothing left to batch through io_uring (which has no getdents opcode);
+    latency across folders is overlapped by the prefetch pool instead.
+    """
+    try:
+        with os.scandir(path) as it:
+            entries = [
+                (entry.name, _entry_is_dir(entry))
+                for entry in it
+                if not entry.name.startswith(".")
+            ]
+    except OSError:
+        return []
+
+    entries.sort(key=lambda e: _entry_sort_key(*e))
+    return entries
+
+
+class DirectoryListingCache:
+    """
+    Thread-safe LRU cache of scan_directory results.
+
+    Entries are validated against the directory's st_mtime_ns, which changes
+    whenever an entry is added, removed or renamed, so a hit never returns a
+    stale listing and revisiting an unchanged folder costs a single stat.
+
+    Folders modified within RACY_NS of being scanned are not cached: the
+    kernel's coarse timestamp clock means a change made right after the scan
+    can leave st_mtime_ns untouched.
+    """
+
+    RACY_NS = 2_000_000_000
+
+    def __init__(self, capacity: int = 1024):
+        self._capacity = capacity
+        self._entries: OrderedDict[str, tuple[int, list[tuple[str, bool]]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, path: str) -> bool:
+        with self._lock:
+            return path in self._entries
+
+    def listing(self, path: str) -> list[tuple[str, bool]]:
+        """Get the listing of a directory, scanning it on a miss."""
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            self.discard(path)
+            return []
+
+        with self._lock:
+            cached = self._entries.get(path)
+            if cached is not None and cached[0] == mtime_ns:
+                self._entries.move_to_end(path)
+                return cached[1]
+
+        scanned_at = time.time_ns()
+        entries = scan_directory(path)
+        if scanned_at - mtime_ns < self.RACY_NS:
+            self.discard(path)
+            return entries
+
+        with self._lock:
+            self._entries[path] = (mtime_ns, entries)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self._capacity:
+                self._entries.popitem(last=False)
+        return entries
+
+    def discard(self, path: str):
+        """Drop a directory's cached listing."""
+        with self._lock:
+            self._entries.pop(path, None)
+
+    def clear(self):
+        """Drop all cached listings."""
+        with self._lock:
+            self._entries.clear()
+
+
+class _PrefetchTask(QRunnable):
+    """Warms the listing cache for a directory the user is likely to expand next."""
+
+    def __init__(self, path: str, cache: DirectoryListingCache):
+        super().__init__()
+        self._path = path
+        self._cache = cache
+
+    def run(self):
+        self._cache.listing(self._path)
+
+
+class _ScanSignals(QObject):
+    """Signals for reporting a finished directory scan to the GUI thread."""
+
+    finished = Signal(int, object, object)  # generation, node, children
+
+
+class _DirectoryScanTask(QRunnable):
+    """Lists one directory on a worker thread and builds its child nodes."""
+
+    def __init__(self, generation: int, node: FileTreeNode, cache: DirectoryListingCache):
+        super().__init__()
+        self._generation = generation
+        self._node = node
+        self._cache = cache
+        self.signals = _ScanSignals()
+
+    def run(self):
+        node = self._node
+        children = [
+            FileTreeNode(name, is_dir, node)
+            for name, is_dir in self._cache.listing(node.path())
+        ]
+        self.signals.finished.emit(self._generation, node, children)
+
+
+class _IconSignals(QObject):
+    """Signals for reporting a file's icon names to the GUI thread."""
+
+    finished = Signal(int, object, str, str)  # generation, node, icon name, generic icon name
+
+
+class _IconLookupTask(QRunnable):
+    """
+    Resolves a file's mime type icon names on a worker thread.
+
+    Only the mime lookup, which may read the file, runs off the GUI thread;
+    QIcon objects are created back on the GUI thread.
+    """
+
+    def __init__(self, generation: int, node: FileTreeNode):
+        super().__init__()
+        self._generation = generation
+        self._node = node
+        self.signals = _IconSignals()
+
+    def run(self):
+        mime_type = QMimeDatabase().mimeTypeForFile(self._node.path())
+        self.signals.finished.emit(
+            self._generation, self._node, mime_type.iconName(), mime_type.genericIconName()
+        )
+
+
+class FileTreeModel(QAbstractItemModel):
+    """
+    Item model exposing a directory tree rooted at a single folder.
+
+    Mirrors the subset of the QFileSystemModel API used by the file tree:
+    setRootPath, rootPath, index(path), filePath and isDir. The root folder
+    itself maps to the invalid index, so it can be passed straight to
+    QTreeView.setRootIndex.
+    """
+
+    PREFETCH_THREADS = 4
+    ICON_THREADS = 10
+
+    _icon_provider = None
+    _folder_icon = None
+    _file_icon = None
+    _theme_icons: dict[str, QIcon] = {}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._root = FileTreeNode("", True)
+        self._generation = 0
+        self._listing_cache = DirectoryListingCache()
+        self._rescanning: set[FileTreeNode] = set()
+        self._rescan_dirty: set[FileTreeNode] = set()
+
+        self._prefetch_pool = QThreadPool(self)
+        self._prefetch_pool.setMaxThreadCount(self.PREFETCH_THREADS)
+
+        self._icon_pool = QThreadPool(self)
+        self._icon_pool.setMaxThreadCount(self.ICON_THREADS)
+
+    @classmethod
+    def _icons(cls):
+        """Get the generic folder and file icons, created on first use."""
+        if cls._folder_icon is None:
+            provider = cls._icon_provider = QFileIconProvider()
+            cls._folder_icon = provider.icon(QFileIconProvider.IconType.Folder)
+            cls._file_icon = provider.icon(QFileIconProvider.IconType.File)
+        return cls._folder_icon, cls._file_icon
+
+    def setRootPath(self, path: str) -> QModelIndex:
+        """Set the folder shown by the model, discarding any loaded entries."""
+        self._prefetch_pool.clear()
+        self._icon_pool.clear()
+        self.beginResetModel()
+        self._generation += 1
+        self._rescanning.clear()
+        self._rescan_dirty.clear()
+        self._root = FileTreeNode(path, True)
+        self.endResetModel()
+        return QModelIndex()
+
+    def rootPath(self) -> str:
+        """Get the folder shown by the model."""
+        return self._root.name
+
+    def _node(self, index: QModelIndex) -> FileTreeNode:
+        """Get the node for an index, the root node for an invalid index."""
+        if index.isValid():
+            return index.internalPointer()
+        return self._root
+
+    def index(self, row, column: int = 0, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        """
+        Get the index for a row under parent, or for a path when given a string.
+
+        Path lookups only resolve entries that have already been loaded.
+        """
+        if isinstance(row, str):
+            return self._index_for_path(row)
+
+        node = self._node(parent)
+        if column != 0 or row < 0 or row >= len(node.children):
+            return QModelIndex()
+        return self.createIndex(row, column, node.children[row])
+
+    def _index_for_path(self, path: str) -> QModelIndex:
+        """Find the index of a loaded entry by its path."""
+        node = self._node_for_path(path)
+        if node is None:
+            return QModelIndex()
+        return self._index_for_node(node)
+
+    def _node_for_path(self, path: str) -> Optional[FileTreeNode]:
+        """Find a loaded node by walking its path from the root."""
+        if not self._root.name or not path:
+            return None
+
+        try:
+            relative = os.path.relpath(os.path.normpath(path), os.path.normpath(self._root.name))
+        except ValueError:
+            return None
+        if relative == os.curdir:
+            return self._root
+        if relative == os.pardir or relative.startswith(os.pardir + os.sep):
+            return None
+
+        node = self._root
+        for part in relative.split(os.sep):
+            node = node.child(part)
+            if node is None:
+                return None
+        return node
+
+    def _is_live(self, node: FileTreeNode) -> bool:
+        """Check whether a node is still attached to the current tree."""
+        while node.parent is not None:
+            node = node.parent
+        return node is self._root
+
+    def _index_for_node(self, node: FileTreeNode) -> QModelIndex:
+        """Get the index of a node, the invalid index for the root."""
+        if node is self._root or node.parent is None:
+            return QModelIndex()
+        return self.createIndex(node.row(), 0, node)
+
+    def parent(self, index: Optional[QModelIndex] = None):
+        """Get the parent index of an item."""
+        if index is None:
+            return QObject.parent(self)
+
+        if not index.isValid():
+            return QModelIndex()
+
+        parent_node = index.internalPointer().parent
+        if parent_node is None or parent_node is self._root:
+            return QModelIndex()
+        return self.createIndex(parent_node.row(), 0, parent_node)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Get the number of loaded children under parent."""
+        if parent.column() > 0:
+            return 0
+        return len(self._node(parent).children)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """The tree only shows file names."""
+        return 1
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        """Directories report children until they are loaded and found empty."""
+        node = self._node(parent)
+        if not node.is_dir:
+            return False
+        if not node.loaded:
+            return True
+        return bool(node.children)
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        """Directories can be fetched once, the first time they are expanded."""
+        node = self._node(parent)
+        return node.is_dir and not node.loaded and bool(self._root.name)
+
+    def fetchMore(self, parent: QModelIndex):
+        """Start listing a directory, showing a placeholder row until it finishes."""
+        node = self._node(parent)
+        if not node.is_dir or node.loaded:
+            return
+        node.loaded = True
+
+        self.beginInsertRows(parent, 0, 0)
+        node.children = [FileTreeNode.loading_placeholder(node)]
+        self.endInsertRows()
+
+        task = _DirectoryScanTask(self._generation, node, self._listing_cache)
+        task.signals.finished.connect(self._on_scan_finished)
+        QThreadPool.globalInstance().start(task)
+
+    def _on_scan_finished(self, generation: int, node: FileTreeNode, children: list):
+        """Replace a folder's placeholder row with its scanned entries."""
+        if generation != self._generation or not self._is_live(node):
+            return
+
+        index = self._index_for_node(node)
+        self.beginRemoveRows(index, 0, len(node.children) - 1)
+        node.children = []
+        self.endRemoveRows()
+
+        # Insert the whole listing in one batch so the view relayouts once
+        # per folder rather than once per entry.
+        if children:
+            self.beginInsertRows(index, 0, len(children) - 1)
+            node.children = children
+            self.endInsertRows()
+            self._prefetch_subdirectories(children)
+
+    def refresh_directory(self, path: str):
+        """
+        Re-list a loaded folder in the background and apply only the differences.
+
+        Folders that are not loaded, or are still loading, are left alone.
+        """
+        node = self._node_for_path(path)
+        if node is not None:
+            self._refresh_node(node)
+
+    def refresh_all(self):
+        """Re-list every loaded folder, applying only the differences."""
+        pending = [self._root]
+        while pending:
+            node = pending.pop()
+            if node.is_dir and node.loaded:
+                self._refresh_node(node)
+                pending.extend(node.children)
+
+    def _refresh_node(self, node: FileTreeNode):
+        """
+        Start a background re-list of a loaded folder.
+
+        A burst of changes to one folder fires the watcher once per change.
+        While a re-list of the folder is running, further requests only mark
+        it dirty, and a single extra pass runs once the current one finishes.
+        """
+        if not node.is_dir or not node.loaded or node.loading:
+            return
+        if node in self._rescanning:
+            self._rescan_dirty.add(node)
+            return
+
+        self._rescanning.add(node)
+        task = _DirectoryScanTask(self._generation, node, self._listing_cache)
+        task.signals.finished.connect(self._on_rescan_finished)
+        QThreadPool.globalInstance().start(task)
+
+    def _on_rescan_finished(self, generation: int, node: FileTreeNode, scanned: list):
+        """Apply a finished re-list, then re-list again if the folder changed meanwhile."""
+        if generation != self._generation:
+            return
+
+        self._rescanning.discard(node)
+        dirty = node in self._rescan_dirty
+        self._rescan_dirty.discard(node)
+        if not self._is_live(node) or node.loading:
+            return
+
+        self._apply_rescan(node, scanned)
+        if dirty:
+            self._refresh_node(node)
+
+    def _apply_rescan(self, node: FileTreeNode, scanned: list[FileTreeNode]):
+        """Remove vanished entries and insert new ones, keeping unchanged rows."""
+        index = self._index_for_node(node)
+        scanned_keys = {child.sort_key() for child in scanned}
+
+        # Remove vanished rows bottom-up, one signal per contiguous run.
+        row = len(node.children) - 1
+        while row >= 0:
+            if node.children[row].sort_key() in scanned_keys:
+                row -= 1
+                continue
+            last = row
+            while row >= 0 and node.children[row].sort_key() not in scanned_keys:
+                row -= 1
+            first = row + 1
+            self.beginRemoveRows(index, first, last)
+            for removed in node.children[first:last + 1]:
+                removed.parent = None
+            del node.children[first:last + 1]
+            self.endRemoveRows()
+
+        # Both lists share the same order, so new entries can be merged in
+        # a single pass, again one signal per contiguous run.
+        kept_keys = {child.sort_key() for child in node.children}
+        row = 0
+        pending: list[FileTreeNode] = []
+        for child in scanned:
+            if child.sort_key() not in kept_keys:
+                pending.append(child)
+                continue
+            if pending:
+                self._insert_children(index, node, row, pending)
+                row += len(pending)
+                pending = []
+            row += 1
+        if pending:
+            self._insert_children(index, node, row, pending)
+
+    def _insert_children(self, index: QModelIndex, node: FileTreeNode, row: int, children: list[FileTreeNode]):
+        """Insert a run of new children at a row."""
+        self.beginInsertRows(index, row, row + len(children) - 1)
+        node.children[row:row] = children
+        self.endInsertRows()
+        self._prefetch_subdirectories(children)
+
+    def _prefetch_subdirectories(self, children: list[FileTreeNode]):
+        """Queue listings of a freshly loaded folder's subfolders so expanding them is instant."""
+        for child in children:
+            if not child.is_dir:
+                continue
+            path = child.path()
+            if path not in self._listing_cache:
+                self._prefetch_pool.start(_PrefetchTask(path, self._listing_cache))
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        """Get display data for an item."""
+        if not index.isValid():
+            return None
+
+        node = index.internalPointer()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return node.name
+        if node.placeholder:
+            return None
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self._decoration(node)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return node.path()
+        return None
+
+    def _decoration(self, node: FileTreeNode) -> QIcon:
+        """
+        Get a node's icon.
+
+        Files show the generic file icon until their mime type icon has been
+        resolved in the background, falling back to the platform's icon for
+        the file where the icon theme has none (Windows and macOS ship no
+        freedesktop theme). Since the view only asks for rows it lays
+        out, off-screen files are never looked up. Folders always use the
+        generic folder icon.
+        """
+        folder_icon, file_icon = self._icons()
+        if node.is_dir:
+            return folder_icon
+        if node.icon is not None:
+            return node.icon
+
+        if not node.icon_requested:
+            node.icon_requested = True
+            task = _IconLookupTask(self._generation, node)
+            task.signals.finished.connect(self._on_icon_found)
+            self._icon_pool.start(task)
+        return file_icon
+
+    def _on_icon_found(self, generation: int, node: FileTreeNode, icon_name: str, generic_name: str):
+        """Store a file's resolved icon and repaint its row."""
+        if generation != self._generation or not self._is_live(node):
+            return
+
+        icon = self._theme_icon(icon_name) or self._theme_icon(generic_name)
+        if icon is None:
+            icon = self._platform_icon(node.path())
+        node.icon = icon or self._icons()[1]
+        if icon is not None:
+            index = self._index_for_node(node)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+    @classmethod
+    def _platform_icon(cls, path: str) -> Optional[QIcon]:
+        """Get the platform file icon provider's icon for a file, None if it has none."""
+        cls._icons()
+        icon = cls._icon_provider.icon(QFileInfo(path))
+        return None if icon.isNull() else icon
+
+    @classmethod
+    def _theme_icon(cls, name: str) -> Optional[QIcon]:
+        """Get a shared icon-theme icon by name, None if the theme lacks it."""
+        if not name:
+            return None
+        if name not in cls._theme_icons:
+            cls._theme_icons[name] = QIcon.fromTheme(name)
+        icon = cls._theme_icons[name]
+        return None if icon.isNull() else icon
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        """
+        Get item flags.
+
+        Files and the placeholder are flagged as never having children so the
+        view does not probe them for expand arrows. Placeholder rows cannot be
+        selected.
+        """
+        if not index.isValid():
+            return super().flags(index)
+
+        node = index.internalPointer()
+        if node.placeholder:
+            return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemNeverHasChildren
+        if not node.is_dir:
+            return super().flags(index) | Qt.ItemFlag.ItemNeverHasChildren
+        return super().flags(index)
+
+    def filePath(self, index: QModelIndex) -> str:
+        """Get the full path of an item."""
+        return self._node(index).path()
+
+    def isDir(self, index: QModelIndex) -> bool:
+        """Check whether an item is a directory."""
+        return self._node(index).is_dir
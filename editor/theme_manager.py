@@ -6,6 +6,7 @@ Provides dark and light themes for the application with custom theme support.
 
 import json
 import os
+import re
 from enum import Enum
 from typing import Optional
 from PySide6.QtWidgets import QApplication
@@ -1648,6 +1649,22 @@ QScrollArea {{
 """
 
 
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def compact_stylesheet(stylesheet: str) -> str:
+    """Collapse runs of whitespace so Qt's stylesheet parser walks fewer bytes."""
+    return _WHITESPACE_RE.sub(" ", stylesheet).strip()
+
+
+# Built-in theme colors never change at runtime, so their stylesheets are
+# generated and compacted once at import time.
+_COMPILED_STYLESHEETS = {
+    name: compact_stylesheet(generate_stylesheet_from_colors(colors))
+    for name, colors in BUILTIN_THEME_COLORS.items()
+}
+
+
 class ThemeManager:
     """Manages application themes with custom theme support."""
     
@@ -1774,11 +1791,13 @@ class ThemeManager:
         }
         self._current_theme = name_to_enum.get(name, Theme.CUSTOM)
         
-        colors = self.get_theme_colors(name)
-        stylesheet = generate_stylesheet_from_colors(colors)
+        stylesheet = _COMPILED_STYLESHEETS.get(name)
+        if stylesheet is None:
+            colors = self.get_theme_colors(name)
+            stylesheet = compact_stylesheet(generate_stylesheet_from_colors(colors))
         
         app = QApplication.instance()
-        if app:
+        if app and app.styleSheet() != stylesheet:
             app.setStyleSheet(stylesheet)
         
         self._save_settings()
@@ -5,6 +5,19 @@ Pytest configuration and shared fixtures.
 import sys
 from pathlib import Path
 
+import pytest
+
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
+
+from PySide6.QtWidgets import QApplication
+
+
+@pytest.fixture(scope="session", autouse=True)
+def qapp():
+    """Create the QApplication instance once for the whole test session."""
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    yield app
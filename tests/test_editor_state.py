@@ -5,20 +5,10 @@ These tests use pytest-qt for Qt widget testing without user interaction.
 """
 
 import pytest
-from PySide6.QtWidgets import QApplication
 
 from editor.editor_widget import EditorWidget
 
 
-@pytest.fixture(scope="session")
-def qapp():
-    """Create a QApplication instance for the test session."""
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication([])
-    yield app
-
-
 @pytest.fixture
 def editor(qapp):
     """Create a fresh EditorWidget for each test."""
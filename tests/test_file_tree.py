@@ -3,23 +3,21 @@ Tests for the file tree module.
 """
 
 import os
+import sys
 import tempfile
 from pathlib import Path
 
 import pytest
-from PySide6.QtCore import Qt, QModelIndex
-from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import Qt, QEvent, QModelIndex, QThreadPool
+from PySide6.QtGui import QIcon, QPixmap
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QApplication, QWidget
 
+from editor import file_tree_model
 from editor.file_tree import FileTree, FileTreeView, CollapsibleSidebar
-
-
-@pytest.fixture(scope="session")
-def qapp():
-    """Create a QApplication instance for the test session."""
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication([])
-    yield app
+from editor.file_tree_model import (
+    FileTreeModel, FileTreeNode, DirectoryListingCache, LOADING_TEXT, scan_directory
+)
 
 
 class TestFileTreeCreation:
@@ -40,6 +38,16 @@ class TestFileTreeCreation:
         assert tree._close_folder_action is not None
         tree.deleteLater()
     
+    def test_toolbar_icons_shared(self, qapp):
+        """Toolbar icons are created once and shared between trees."""
+        first = FileTree()
+        second = FileTree()
+        assert not first._open_folder_action.icon().isNull()
+        assert (first._refresh_action.icon().cacheKey()
+                == second._refresh_action.icon().cacheKey())
+        first.deleteLater()
+        second.deleteLater()
+    
     def test_file_tree_has_tree_view(self, qapp):
         """FileTree has a tree view."""
         tree = FileTree()
@@ -47,6 +55,24 @@ class TestFileTreeCreation:
         assert isinstance(tree._tree_view, FileTreeView)
         tree.deleteLater()
     
+    def test_tree_view_uniform_row_heights(self, qapp):
+        """Rows share one height so only visible rows are measured."""
+        tree = FileTree()
+        assert tree._tree_view.uniformRowHeights()
+        tree.deleteLater()
+    
+    def test_tree_view_single_column(self, qapp):
+        """Only the name column exists, so none need hiding."""
+        tree = FileTree()
+        assert tree._tree_view.header().count() == 1
+        tree.deleteLater()
+    
+    def test_tree_view_sorting_disabled(self, qapp):
+        """The view does not re-sort; the model delivers sorted listings."""
+        tree = FileTree()
+        assert not tree._tree_view.isSortingEnabled()
+        tree.deleteLater()
+    
     def test_initial_root_path_is_none(self, qapp):
         """Initially no folder is open."""
         tree = FileTree()
@@ -73,6 +99,17 @@ class TestFileTreeOpenFolder:
             assert tree._close_folder_action.isEnabled()
         tree.deleteLater()
     
+    def test_open_symlinked_folder_resolves(self, qapp, tmp_path):
+        """Opening a symlink to a folder shows the real folder path."""
+        target = tmp_path / "target"
+        target.mkdir()
+        link = tmp_path / "link"
+        link.symlink_to(target, target_is_directory=True)
+        tree = FileTree()
+        assert tree.open_folder(str(link)) is True
+        assert tree.root_path == str(target.resolve())
+        tree.deleteLater()
+    
     def test_open_invalid_folder(self, qapp):
         """Opening non-existent folder returns False."""
         tree = FileTree()
@@ -129,6 +166,41 @@ class TestFileTreeRefresh:
             assert tree.root_path == str(Path(tmpdir).resolve())
         tree.deleteLater()
     
+    def test_refresh_keeps_expanded_folders(self, qapp, sample_dir):
+        """Refreshing restores the folders that were expanded."""
+        tree = FileTree()
+        tree.open_folder(str(sample_dir))
+        tree._model.fetchMore(QModelIndex())
+        settle()
+        tree._tree_view.expand(tree._model.index(str(sample_dir / "src")))
+        settle()
+        tree.refresh()
+        settle()
+        assert tree._tree_view.isExpanded(tree._model.index(str(sample_dir / "src")))
+        assert not tree._tree_view.isExpanded(tree._model.index(str(sample_dir / "docs")))
+        tree.deleteLater()
+    
+    def test_refresh_picks_up_new_files(self, qapp, sample_dir):
+        """Refresh inserts files created since the folder was loaded."""
+        tree = FileTree()
+        tree.open_folder(str(sample_dir))
+        tree._model.fetchMore(QModelIndex())
+        settle()
+        (sample_dir / "c.txt").write_text("c")
+        tree.refresh()
+        settle()
+        assert tree._model.index(str(sample_dir / "c.txt")).isValid()
+        tree.deleteLater()
+    
+    def test_open_folder_watches_root(self, qapp, sample_dir):
+        """The open folder is watched for changes."""
+        tree = FileTree()
+        tree.open_folder(str(sample_dir))
+        assert tree._watcher.directories() == [os.path.realpath(sample_dir)]
+        tree.close_folder()
+        assert tree._watcher.directories() == [os.path.expanduser("~")]
+        tree.deleteLater()
+    
     def test_refresh_without_folder(self, qapp):
         """Refresh is safe when no folder is open."""
         tree = FileTree()
@@ -137,6 +209,482 @@ class TestFileTreeRefresh:
         tree.deleteLater()
 
 
+def fetch_and_wait(model, parent=QModelIndex()):
+    """Fetch a folder and deliver the background scan result."""
+    model.fetchMore(parent)
+    QThreadPool.globalInstance().waitForDone()
+    QApplication.processEvents()
+
+
+def settle():
+    """Deliver background scans until no more are pending."""
+    for _ in range(5):
+        QThreadPool.globalInstance().waitForDone()
+        QApplication.processEvents()
+
+
+def age(path):
+    """Push a folder's mtime an hour into the past so its listing is cacheable."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - 3600 * 10**9))
+
+
+@pytest.fixture
+def sample_dir(tmp_path):
+    """
+    Create a small directory tree for model tests.
+    
+    The path is resolved, since open_folder resolves symlinks (such as
+    macOS's /var -> /private/var) and tests look entries up by path.
+    """
+    tmp_path = tmp_path.resolve()
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "main.py").write_text("print()")
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "b.txt").write_text("b")
+    (tmp_path / "A.txt").write_text("a")
+    (tmp_path / ".hidden").write_text("h")
+    for folder in (tmp_path, tmp_path / "src", tmp_path / "docs"):
+        age(folder)
+    return tmp_path
+
+
+class TestFileTreeNode:
+    """Tests for the file tree's node structure."""
+    
+    def test_path_built_from_parents(self):
+        """Nodes store their name and rebuild the full path from parents."""
+        root = FileTreeNode("/projects", True)
+        src = FileTreeNode("src", True, root)
+        main = FileTreeNode("main.py", False, src)
+        assert main.name == "main.py"
+        assert main.path() == os.path.join("/projects", "src", "main.py")
+        assert root.path() == "/projects"
+    
+    def test_nodes_use_slots(self):
+        """Nodes carry no per-instance dict."""
+        assert not hasattr(FileTreeNode("a", False), "__dict__")
+    
+    def test_child_lookup_and_row(self):
+        """Children are found by name and report their row."""
+        root = FileTreeNode("/projects", True)
+        root.children = [
+            FileTreeNode("docs", True, root),
+            FileTreeNode("src", True, root),
+            FileTreeNode("a.txt", False, root),
+            FileTreeNode("Z.txt", False, root),
+        ]
+        assert root.child("src") is root.children[1]
+        assert root.child("Z.txt").row() == 3
+        assert root.child("missing") is None
+    
+    def test_sort_key_computed_once(self):
+        """A node's sort key orders folders first and is reused across calls."""
+        folder = FileTreeNode("Zeta", True)
+        file = FileTreeNode("alpha", False)
+        assert folder.sort_key() < file.sort_key()
+        assert folder.sort_key() is folder.sort_key()
+    
+    def test_placeholder_has_no_path(self):
+        """The loading placeholder reports an empty path."""
+        root = FileTreeNode("/projects", True)
+        assert FileTreeNode.loading_placeholder(root).path() == ""
+
+
+class TestFileTreeModel:
+    """Tests for the lazy FileTreeModel."""
+    
+    def test_root_path(self, qapp, sample_dir):
+        """Model reports the root path it was given."""
+        model = FileTreeModel()
+        model.setRootPath(str(sample_dir))
+        assert model.rootPath() == str(sample_dir)
+    
+    def test_root_not_loaded_until_fetched(self, qapp, sample_dir):
+        """Directory contents are not listed until fetchMore is called."""
+        model = FileTreeModel()
+        model.setRootPath(str(sample_dir))
+        assert model.rowCount() == 0
+        assert model.hasChildren()
+        assert model.canFetchMore(QModelIndex())
+    
+    def test_fetch_lists_dirs_first_sorted(self, qapp, sample_dir):
+        """Fetched entries list folders first, then files, case-insensitively."""
+        model = FileTreeModel()
+        model.setRootPath(str(sample_dir))
+        fetch_and_wait(model)
+        names = [model.data(model.index(i, 0)) for i in range(model.rowCount())]
+        assert names == ["docs", "src", "A.txt", "b.txt"]
+        assert not model.canFetchMore(QModelIndex())
+    
+    def test_fetch_inserts_rows_in_one_batch(self, qapp, sample_dir):
+        """A folder's entries are inserted with a single rowsInserted signal."""
+        model = FileTreeModel()
+        model.setRootPath(str(sample_dir))
+        inserted = []
+        model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+        fetch_and_wait(model)
+        # The first insertion is the loading placeholder.
+        assert inserted == [(0, 0), (0, 3)]
+    
+    def test_fetch_empty_directory_inserts_only_placeholder(self, qapp, sample_dir):
+        """Fetching an empty folder inserts nothing beyond the placeholder."""
+        model = FileTreeModel()
+        model.setRootPath(str(sample_dir / "docs"))
+        inserted = []
+        model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+        fetch_and_wait(model)
+        assert inserted == [(0, 0)]
+        assert model.rowCount() == 0
+    
+    def test_placeholder_shown_while_loading(self, qapp, sample_dir):
+        """A loading placeholder row is shown until the scan is delivered."""
+        model = FileTreeModel()
+        model.setRootPath(str(sample_dir))
+        model.fetchMore(QModelIndex())
+        assert model.rowCount() == 1
+        placeholder = model.index(0, 0)
+        assert model.data(placeholder) == LOADING_TEXT
+        assert model.filePath(placeholder) == ""
+        assert not model.flags(placeholder) & Qt.ItemFlag.ItemIsSelectable
+        QThreadPool.globalInstance().waitForDone()
+        QApplication.processEvents()
+        assert model.rowCount() == 4
+    
+    def test_stale_scan_ignored_after_reset(self, qapp, sample_dir):
+        """A scan finishing after the root changed is discarded."""
+        model = FileTreeModel()
+        model.setRootPath(str(sample_dir))
+        model.fetchMore(QModelIndex())
+        model.setRootPath(str(sample_dir / "src"))
+        QThreadPool.globalInstance().waitForDone()
+        QApplication.processEvents()
+        assert model.rowCount() == 0
+    
+    def test_file_icon_resolved_in_background(self, qapp, sample_dir, monkeypatch):
+        """Files show a generic icon until their mime icon is resolved."""
+        pixmap = QPixmap(16, 16)
+        pixmap.fill(Qt.GlobalColor.red)
+        text_icon = QIcon(pixmap)
+        monkeypatch.setitem(FileTreeModel._theme_icons, "text-plain", text_icon)
+        
+        model = FileTreeModel()
+        model.setRootPath(str(sample_dir))
+        fetch_and_wait(model)
+        changed = []
+        model.dataChanged.connect(lambda first, last, roles: changed.append((first.row(), roles)))
+        
+        b_txt = model.index(3, 0)
+        _, file_icon = FileTreeModel._icons()
+        assert model.data(b_txt, Qt.ItemDataRole.DecorationRole).cacheKey() == file_icon.cacheKey()
+        model._icon_pool.waitForDone()
+        QApplication.processEvents()
+        
+        assert changed == [(3, [Qt.ItemDataRole.DecorationRole])]
+        assert model.data(b_txt, Qt.ItemDataRole.DecorationRole).cacheKey() == text_icon.cacheKey()
+    
+    def test_file_icon_falls_back_to_platform_icon(self, qapp, sample_dir, monkeypatch):
+        """Files the icon theme has no icon for get the platform provider's icon."""
+        pixmap = QPixmap(16, 16)
+        pixmap.fill(Qt.GlobalColor.blue)
+        platform_icon = QIcon(pixmap)
+        requested = []
+        
+        class FakeProvider:
+            def icon(self, info):
+                requested.append(info.filePath())
+                return platform_icon
+        
+        FileTreeModel._icons()
+        monkeypatch.setattr(FileTreeModel, "_icon_provider", FakeProvider())
+        monkeypatch.setattr(FileTreeModel, "_theme_icon", classmethod(lambda cls, name: None))
+        
+        model = FileTreeModel()
+        model.setRootPath(str(sample_dir))
+        fetch_and_wait(model)
+        b_txt = model.index(3, 0)
+        model.data(b_txt, Qt.ItemDataRole.DecorationRole)
+        model._icon_pool.waitForDone()
+        QApplication.processEvents()
+        
+        assert requested == [str(sample_dir / "b.txt")]
+        assert model.data(b_txt, Qt.ItemDataRole.DecorationRole).cacheKey() == platform_icon.cacheKey()
+    
+    def test_folder_icon_not_looked_up(self, qapp, sample_dir):
+        """Folders use the generic folder icon without a background lookup."""
+        model = FileTreeModel()
+        model.setRootPath(str(sample_dir))
+        fetch_and_wait(model)
+        folder_icon, _ = FileTreeModel._icons()
+        docs = model.index(0, 0)
+        assert model.data(docs, Qt.ItemDataRole.DecorationRole).cacheKey() == folder_icon.cacheKey()
+        assert not docs.internalPointer().icon_requested
+    
+    def test_files_never_have_children(self, qapp, sample_dir):
+        """Files are flagged so the view never probes them for children."""
+        model = FileTreeModel()
+        model.setRootPath(str(sample_dir))
+        fetch_and_wait(model)
+        assert model.flags(model.index(2, 0)) & Qt.ItemFlag.ItemNeverHasChildren
+        assert not model.flags(model.index(0, 0)) & Qt.ItemFlag.ItemNeverHasChildren
+    
+    def test_single_column(self, qapp, sample_dir):
+        """Model exposes only the name column."""
+        model = FileTreeModel()
+        assert model.columnCount() == 1
+    
+    def test_file_path_and_is_dir(self, qapp, sample_dir):
+        """filePath and isDir describe each entry."""
+        model = FileTreeModel()
+        model.setRootPath(str(sample_dir))
+        fetch_and_wait(model)
+        docs = model.index(0, 0)
+        a_txt = model.index(2, 0)
+        assert model.filePath(docs) == str(sample_dir / "docs")
+        assert model.isDir(docs)
+        assert model.filePath(a_txt) == str(sample_dir / "A.txt")
+        assert not model.isDir(a_txt)
+        assert not model.hasChildren(a_txt)
+    
+    def test_fetch_subdirectory(self, qapp, sample_dir):
+        """Subdirectories are loaded on demand and parent back correctly."""
+        model = FileTreeModel()
+        model.setRootPath(str(sample_dir))
+        fetch_and_wait(model)
+        src = model.index(1, 0)
+        assert model.canFetchMore(src)
+        fetch_and_wait(model, src)
+        assert model.rowCount(src) == 1
+        child = model.index(0, 0, src)
+        assert model.filePath(child) == str(sample_dir / "src" / "main.py")
+        assert model.parent(child) == src
+        assert model.parent(src) == QModelIndex()
+    
+    def test_index_for_path(self, qapp, sample_dir):
+        """index() accepts a path for loaded entries."""
+        model = FileTreeModel()
+        model.setRootPath(str(sample_dir))
+        fetch_and_wait(model)
+        assert model.index(str(sample_dir)) == QModelIndex()
+        index = model.index(str(sample_dir / "b.txt"))
+        assert index.isValid()
+        assert model.filePath(index) == str(sample_dir / "b.txt")
+    
+    def test_empty_directory_has_no_children(self, qapp, sample_dir):
+        """An empty folder stops reporting children once fetched."""
+        model = FileTreeModel()
+        model.setRootPath(str(sample_dir))
+        fetch_and_wait(model)
+        docs = model.index(0, 0)
+        fetch_and_wait(model, docs)
+        assert model.rowCount(docs) == 0
+        assert not model.hasChildren(docs)
+    
+    def test_unreadable_directory_is_empty(self, qapp):
+        """A missing folder yields no entries instead of raising."""
+        model = FileTreeModel()
+        model.setRootPath("/nonexistent/path/that/does/not/exist")
+        fetch_and_wait(model)
+        assert model.rowCount() == 0
+
+
+class TestScanDirectory:
+    """Tests for listing a single directory."""
+    
+    def test_lists_visible_entries_sorted(self, sample_dir):
+        """Entries are (name, is_dir) pairs, folders first, hidden ones skipped."""
+        assert scan_directory(str(sample_dir)) == [
+            ("docs", True), ("src", True), ("A.txt", False), ("b.txt", False)
+        ]
+    
+    def test_skips_hidden_folders(self, tmp_path):
+        """Hidden folders are filtered out like hidden files."""
+        (tmp_path / ".git").mkdir()
+        (tmp_path / "visible").mkdir()
+        assert scan_directory(str(tmp_path)) == [("visible", True)]
+    
+    def test_symlinked_folder_is_dir(self, tmp_path):
+        """Symlinks to folders are listed as folders."""
+        (tmp_path / "real").mkdir()
+        (tmp_path / "alias").symlink_to(tmp_path / "real", target_is_directory=True)
+        assert scan_directory(str(tmp_path)) == [("alias", True), ("real", True)]
+    
+    def test_symlink_loop_listed_with_other_entries(self, tmp_path):
+        """An entry whose type cannot be resolved does not hide its siblings."""
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "real.txt").write_text("")
+        (tmp_path / "a").symlink_to(tmp_path / "b")
+        (tmp_path / "b").symlink_to(tmp_path / "a")
+        assert scan_directory(str(tmp_path)) == [
+            ("sub", True), ("a", False), ("b", False), ("real.txt", False)
+        ]
+    
+    def test_missing_directory(self):
+        """A missing folder lists as empty."""
+        assert scan_directory("/nonexistent/path/that/does/not/exist") == []
+
+
+class TestDirectoryListingCache:
+    """Tests for the mtime-validated directory listing cache."""
+    
+    def test_hit_returns_cached_listing(self, sample_dir):
+        """A second lookup of an unchanged folder reuses the listing."""
+        cache = DirectoryListingCache()
+        first = cache.listing(str(sample_dir))
+        assert first == [("docs", True), ("src", True), ("A.txt", False), ("b.txt", False)]
+        assert cache.listing(str(sample_dir)) is first
+    
+    def test_mtime_change_rescans(self, sample_dir):
+        """A folder whose mtime changed is listed again."""
+        cache = DirectoryListingCache()
+        first = cache.listing(str(sample_dir))
+        (sample_dir / "c.txt").write_text("c")
+        age(sample_dir)
+        second = cache.listing(str(sample_dir))
+        assert second is not first
+        assert ("c.txt", False) in second
+        assert len(cache) == 1
+    
+    def test_evicts_least_recently_used(self, sample_dir):
+        """The cache keeps at most its capacity, dropping the oldest entry."""
+        cache = DirectoryListingCache(capacity=2)
+        cache.listing(str(sample_dir))
+        cache.listing(str(sample_dir / "src"))
+        cache.listing(str(sample_dir))
+        cache.listing(str(sample_dir / "docs"))
+        assert len(cache) == 2
+        assert str(sample_dir) in cache
+        assert str(sample_dir / "src") not in cache
+    
+    def test_recently_modified_folder_not_cached(self, sample_dir):
+        """A folder modified moments before the scan is listed again next time."""
+        cache = DirectoryListingCache()
+        (sample_dir / "c.txt").write_text("c")
+        cache.listing(str(sample_dir))
+        assert str(sample_dir) not in cache
+    
+    def test_missing_directory(self):
+        """A missing folder lists as empty and is not cached."""
+        cache = DirectoryListingCache()
+        assert cache.listing("/nonexistent/path/that/does/not/exist") == []
+        assert len(cache) == 0
+    
+    def test_model_reuses_cache_after_reset(self, qapp, sample_dir):
+        """Re-rooting the model at the same folder serves it from the cache."""
+        model = FileTreeModel()
+        model.setRootPath(str(sample_dir))
+        fetch_and_wait(model)
+        assert str(sample_dir) in model._listing_cache
+        model.setRootPath(str(sample_dir))
+        fetch_and_wait(model)
+        assert model.rowCount() == 4
+    
+    def test_loading_folder_prefetches_subfolders(self, qapp, sample_dir):
+        """Loading a folder warms the cache for its subfolders."""
+        model = FileTreeModel()
+        model.setRootPath(str(sample_dir))
+        fetch_and_wait(model)
+        model._prefetch_pool.waitForDone()
+        assert str(sample_dir / "src") in model._listing_cache
+        assert str(sample_dir / "docs") in model._listing_cache
+        assert str(sample_dir / "A.txt") not in model._listing_cache
+
+
+class TestFileTreeModelRefresh:
+    """Tests for applying folder changes without resetting the model."""
+    
+    def _loaded_model(self, sample_dir):
+        model = FileTreeModel()
+        model.setRootPath(str(sample_dir))
+        fetch_and_wait(model)
+        return model
+    
+    def _names(self, model, parent=QModelIndex()):
+        return [model.data(model.index(i, 0, parent)) for i in range(model.rowCount(parent))]
+    
+    def test_new_entries_inserted(self, qapp, sample_dir):
+        """New files and folders are inserted in sorted position."""
+        model = self._loaded_model(sample_dir)
+        (sample_dir / "lib").mkdir()
+        (sample_dir / "c.txt").write_text("c")
+        inserted = []
+        model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+        model.refresh_directory(str(sample_dir))
+        settle()
+        assert self._names(model) == ["docs", "lib", "src", "A.txt", "b.txt", "c.txt"]
+        assert inserted == [(1, 1), (5, 5)]
+    
+    def test_removed_entries_deleted(self, qapp, sample_dir):
+        """Vanished entries are removed, one signal per contiguous run."""
+        model = self._loaded_model(sample_dir)
+        (sample_dir / "A.txt").unlink()
+        (sample_dir / "b.txt").unlink()
+        removed = []
+        model.rowsRemoved.connect(lambda parent, first, last: removed.append((first, last)))
+        model.refresh_directory(str(sample_dir))
+        settle()
+        assert self._names(model) == ["docs", "src"]
+        assert removed == [(2, 3)]
+        assert not model.index(str(sample_dir / "A.txt")).isValid()
+    
+    def test_unchanged_rows_keep_their_nodes(self, qapp, sample_dir):
+        """Rows that did not change keep their node, so expansion survives."""
+        model = self._loaded_model(sample_dir)
+        src_node = model.index(str(sample_dir / "src")).internalPointer()
+        (sample_dir / "c.txt").write_text("c")
+        model.refresh_directory(str(sample_dir))
+        settle()
+        assert model.index(str(sample_dir / "src")).internalPointer() is src_node
+    
+    def test_removed_folder_forgets_descendants(self, qapp, sample_dir):
+        """Removing a loaded folder drops its children from path lookups."""
+        model = self._loaded_model(sample_dir)
+        fetch_and_wait(model, model.index(str(sample_dir / "src")))
+        assert model.index(str(sample_dir / "src" / "main.py")).isValid()
+        (sample_dir / "src" / "main.py").unlink()
+        (sample_dir / "src").rmdir()
+        model.refresh_directory(str(sample_dir))
+        settle()
+        assert not model.index(str(sample_dir / "src" / "main.py")).isValid()
+    
+    def test_refresh_all_updates_subfolders(self, qapp, sample_dir):
+        """refresh_all re-lists every loaded folder."""
+        model = self._loaded_model(sample_dir)
+        src = model.index(str(sample_dir / "src"))
+        fetch_and_wait(model, src)
+        (sample_dir / "src" / "util.py").write_text("")
+        model.refresh_all()
+        settle()
+        src = model.index(str(sample_dir / "src"))
+        assert self._names(model, src) == ["main.py", "util.py"]
+    
+    def test_burst_of_changes_rescans_once_more(self, qapp, sample_dir, monkeypatch):
+        """Refreshes arriving while a folder is being re-listed coalesce into one extra pass."""
+        model = self._loaded_model(sample_dir)
+        model._prefetch_pool.waitForDone()
+        scans = []
+        
+        def counting_scan(path):
+            scans.append(path)
+            return scan_directory(path)
+        
+        monkeypatch.setattr(file_tree_model, "scan_directory", counting_scan)
+        for i in range(200):
+            (sample_dir / f"new{i:03}.txt").write_text("")
+            model.refresh_directory(str(sample_dir))
+        settle()
+        assert len(scans) <= 2
+        assert model.rowCount() == 204
+    
+    def test_unloaded_folder_not_rescanned(self, qapp, sample_dir):
+        """Refreshing a folder that was never loaded does nothing."""
+        model = FileTreeModel()
+        model.setRootPath(str(sample_dir))
+        model.refresh_directory(str(sample_dir))
+        settle()
+        assert model.rowCount() == 0
+
+
 class TestFileTreeView:
     """Tests for the custom FileTreeView."""
     
@@ -151,6 +699,41 @@ class TestFileTreeView:
         view = FileTreeView()
         assert hasattr(view, 'middle_clicked')
         view.deleteLater()
+    
+    def test_middle_click_emits_index(self, qapp, sample_dir):
+        """Middle-clicking a row emits middle_clicked and opens files in a new tab."""
+        tree = FileTree()
+        tree.open_folder(str(sample_dir))
+        tree.show()
+        settle()
+        view = tree._tree_view
+        a_txt = tree._model.index(str(sample_dir / "A.txt"))
+        view.scrollTo(a_txt)
+        clicked = []
+        opened = []
+        view.middle_clicked.connect(clicked.append)
+        tree.file_open_new_tab_requested.connect(opened.append)
+        QTest.mouseClick(view.viewport(), Qt.MouseButton.MiddleButton,
+                         pos=view.visualRect(a_txt).center())
+        assert clicked == [a_txt]
+        assert opened == [str(sample_dir / "A.txt")]
+        tree.deleteLater()
+    
+    def test_left_click_does_not_emit_middle_clicked(self, qapp, sample_dir):
+        """Other buttons fall through to the default handling."""
+        tree = FileTree()
+        tree.open_folder(str(sample_dir))
+        tree.show()
+        settle()
+        view = tree._tree_view
+        a_txt = tree._model.index(str(sample_dir / "A.txt"))
+        clicked = []
+        view.middle_clicked.connect(clicked.append)
+        QTest.mouseClick(view.viewport(), Qt.MouseButton.LeftButton,
+                         pos=view.visualRect(a_txt).center())
+        assert clicked == []
+        assert view.currentIndex() == a_txt
+        tree.deleteLater()
 
 
 class TestFileTreeSignals:
@@ -215,9 +798,63 @@ class TestCollapsibleSidebar:
         signal_received = []
         sidebar.collapsed_changed.connect(lambda v: signal_received.append(v))
         sidebar.set_collapsed(True)
+        QApplication.processEvents()
+        assert signal_received == [True]
+        sidebar.deleteLater()
+    
+    def test_collapsed_changed_coalesces_rapid_toggles(self, qapp):
+        """Toggles within one event loop pass emit only the final state."""
+        sidebar = CollapsibleSidebar()
+        signal_received = []
+        sidebar.collapsed_changed.connect(lambda v: signal_received.append(v))
+        sidebar.set_collapsed(True)
+        sidebar.set_collapsed(False)
+        sidebar.set_collapsed(True)
+        assert signal_received == []
+        QApplication.processEvents()
         assert signal_received == [True]
         sidebar.deleteLater()
     
+    def test_collapsed_changed_skips_round_trip(self, qapp):
+        """Toggling back to the emitted state emits nothing."""
+        sidebar = CollapsibleSidebar()
+        signal_received = []
+        sidebar.collapsed_changed.connect(lambda v: signal_received.append(v))
+        sidebar.set_collapsed(True)
+        sidebar.set_collapsed(False)
+        QApplication.processEvents()
+        assert signal_received == []
+        sidebar.deleteLater()
+    
+    def test_pending_signal_dropped_with_sidebar(self, qapp, monkeypatch):
+        """A sidebar destroyed before its deferred emission runs emits nothing."""
+        errors = []
+        monkeypatch.setattr(sys, "excepthook", lambda *exc_info: errors.append(exc_info))
+        parent = QWidget()
+        sidebar = CollapsibleSidebar(parent)
+        sidebar.set_collapsed(True)
+        parent.deleteLater()
+        QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+        QApplication.processEvents()
+        assert errors == []
+    
+    def test_expanded_width(self, qapp):
+        """Expanded sidebar is fixed at its expanded width."""
+        sidebar = CollapsibleSidebar()
+        assert sidebar.minimumWidth() == sidebar.maximumWidth() == 200
+        sidebar.deleteLater()
+    
+    def test_unchanged_width_not_reapplied(self, qapp, monkeypatch):
+        """Size constraints are only re-applied when the width changes."""
+        sidebar = CollapsibleSidebar()
+        calls = []
+        monkeypatch.setattr(sidebar, "setFixedWidth", calls.append)
+        sidebar._update_size_constraints()
+        assert calls == []
+        sidebar.set_collapsed(True)
+        assert calls == [CollapsibleSidebar.COLLAPSED_WIDTH]
+        sidebar.deleteLater()
+    
     def test_collapsed_width(self, qapp):
         """Collapsed sidebar has narrow width."""
         sidebar = CollapsibleSidebar()
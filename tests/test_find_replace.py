@@ -3,7 +3,6 @@ Tests for Find and Replace functionality.
 """
 
 import pytest
-from PySide6.QtWidgets import QApplication
 from PySide6.QtGui import QTextCursor
 
 from editor.document import Document
@@ -15,15 +14,6 @@ from editor.find_replace import (
 )
 
 
-@pytest.fixture(scope="session")
-def qapp():
-    """Create a QApplication instance for the test session."""
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication([])
-    yield app
-
-
 @pytest.fixture
 def pane(qapp):
     """Create a fresh EditorPane for each test."""
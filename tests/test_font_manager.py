@@ -3,22 +3,12 @@ Tests for the FontManagerWidget in settings_dialog.
 """
 
 import pytest
-from PySide6.QtWidgets import QApplication
 from PySide6.QtGui import QFont
 
 from editor.settings_dialog import FontManagerWidget, FontManagerDialog
 from editor.theme_manager import ThemeManager
 
 
-@pytest.fixture(scope="session")
-def qapp():
-    """Create a QApplication instance for the test session."""
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication([])
-    yield app
-
-
 @pytest.fixture
 def font_widget(qapp):
     """Create a fresh FontManagerWidget for each test."""
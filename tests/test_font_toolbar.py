@@ -3,21 +3,12 @@ Tests for the FontMiniToolbar module.
 """
 
 import pytest
-from PySide6.QtWidgets import QApplication, QPlainTextEdit
+from PySide6.QtWidgets import QPlainTextEdit
 from PySide6.QtGui import QFont, QTextCursor
 
 from editor.font_toolbar import FontMiniToolbar
 
 
-@pytest.fixture(scope="session")
-def qapp():
-    """Create a QApplication instance for the test session."""
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication([])
-    yield app
-
-
 @pytest.fixture
 def toolbar(qapp):
     """Create a fresh FontMiniToolbar for each test."""
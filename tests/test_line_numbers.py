@@ -3,27 +3,37 @@ Tests for the LineNumberedEditor module.
 """
 
 import pytest
-from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import Qt
 from PySide6.QtGui import QColor
 
 from editor.line_number_editor import LineNumberedEditor, LineNumberArea
 
 
-@pytest.fixture(scope="session")
-def qapp():
-    """Create a QApplication instance for the test session."""
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication([])
-    yield app
+_THOUSAND_LINES = "\n".join(f"Line {i}" for i in range(1, 1001))
 
+# (bg, text, current_line, current_line_bg) hex strings paired with their parsed colors
+_LINE_NUMBER_COLORS = [
+    (hexes, tuple(QColor(h) for h in hexes))
+    for hexes in (
+        ("#111111", "#222222", "#333333", "#444444"),
+        ("#ff0000", "#00ff00", "#0000ff", "#ffffff"),
+    )
+]
 
-@pytest.fixture
-def editor(qapp):
-    """Create a fresh LineNumberedEditor for each test."""
+
+@pytest.fixture(scope="module")
+def shared_editor(qapp):
+    """Create one LineNumberedEditor shared by the tests in this module."""
     widget = LineNumberedEditor()
-    yield widget
-    widget.deleteLater()
+    widget.setAttribute(Qt.WidgetAttribute.WA_DontShowOnScreen, True)
+    return widget
+
+
+@pytest.fixture
+def editor(shared_editor):
+    """Provide the shared LineNumberedEditor with its text cleared."""
+    shared_editor.clear()
+    yield shared_editor
 
 
 class TestLineNumberedEditorInit:
@@ -61,7 +71,7 @@ class TestLineNumberAreaWidth:
         editor.setPlainText("Line 1")
         width_1 = editor.line_number_area_width()
         
-        editor.setPlainText("\n".join([f"Line {i}" for i in range(1, 1001)]))
+        editor.setPlainText(_THOUSAND_LINES)
         width_1000 = editor.line_number_area_width()
         
         assert width_1000 > width_1
@@ -70,20 +80,15 @@ class TestLineNumberAreaWidth:
 class TestLineNumberColors:
     """Tests for line number color configuration."""
     
-    def test_set_line_number_colors(self, editor):
-        """Can set line number colors."""
-        editor.set_line_number_colors("#111111", "#222222", "#333333", "#444444")
-        assert editor._bg_color == QColor("#111111")
-        assert editor._text_color == QColor("#222222")
-        assert editor._current_line_color == QColor("#333333")
-        assert editor._current_line_bg == QColor("#444444")
-    
-    def test_colors_accept_hex_strings(self, editor):
-        """Colors accept hex color strings."""
-        editor.set_line_number_colors("#ff0000", "#00ff00", "#0000ff", "#ffffff")
-        assert editor._bg_color.red() == 255
-        assert editor._text_color.green() == 255
-        assert editor._current_line_color.blue() == 255
+    @pytest.mark.parametrize("hexes, expected", _LINE_NUMBER_COLORS)
+    def test_set_line_number_colors(self, editor, hexes, expected):
+        """Line number colors are set from hex color strings."""
+        bg, text, current_line, current_line_bg = expected
+        editor.set_line_number_colors(*hexes)
+        assert editor._bg_color == bg
+        assert editor._text_color == text
+        assert editor._current_line_color == current_line
+        assert editor._current_line_bg == current_line_bg
 
 
 class TestLineNumberArea:
@@ -103,8 +108,7 @@ class TestCurrentLineHighlight:
     def test_extra_selections_set(self, editor):
         """Editor has extra selections for current line."""
         editor.setPlainText("Line 1\nLine 2\nLine 3")
-        selections = editor.extraSelections()
-        assert len(selections) >= 1
+        assert editor.extraSelections()
     
     def test_highlight_updates_on_cursor_move(self, editor):
         """Highlight updates when cursor moves."""
@@ -112,5 +116,4 @@ class TestCurrentLineHighlight:
         cursor = editor.textCursor()
         cursor.movePosition(cursor.MoveOperation.Down)
         editor.setTextCursor(cursor)
-        selections = editor.extraSelections()
-        assert len(selections) >= 1
+        assert editor.extraSelections()
@@ -5,9 +5,7 @@ Tests for the Settings Dialog and Theme Manager enhancements.
 import os
 import json
 import tempfile
-import pytest
 from unittest.mock import patch, MagicMock
-from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import Qt
 
 from editor.settings_dialog import (
@@ -19,15 +17,6 @@ from editor.theme_manager import (
 )
 
 
-@pytest.fixture(scope="session")
-def qapp():
-    """Create a QApplication instance for the test session."""
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication([])
-    yield app
-
-
 class TestColorButton:
     """Tests for ColorButton widget."""
     
@@ -3,20 +3,11 @@ Tests for the EditorTabBar module.
 """
 
 import pytest
-from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QPoint
 
 from editor.tab_bar import EditorTabBar
 
 
-@pytest.fixture(scope="session")
-def qapp():
-    """Create a QApplication instance for the test session."""
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication([])
-    yield app
-
-
 @pytest.fixture
 def tab_bar(qapp):
     """Create a fresh EditorTabBar for each test."""
@@ -115,12 +106,10 @@ class TestTabBarDropIndex:
     
     def test_get_drop_index_empty(self, tab_bar):
         """Drop index is 0 for empty tab bar."""
-        from PySide6.QtCore import QPoint
         assert tab_bar.get_drop_index(QPoint(0, 0)) == 0
     
     def test_get_drop_index_with_tabs(self, tab_bar):
         """Drop index calculated correctly with tabs."""
-        from PySide6.QtCore import QPoint
         tab_bar.addTab("Tab 1")
         tab_bar.addTab("Tab 2")
         index = tab_bar.get_drop_index(QPoint(1000, 0))
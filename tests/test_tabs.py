@@ -3,102 +3,151 @@ Tests for tab and pane management.
 """
 
 import pytest
-from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QColor
 
 from editor.document import Document
 from editor.editor_pane import EditorPane
 from editor.split_container import SplitContainer
-from editor.theme_manager import ThemeManager, Theme
+from editor.theme_manager import BUILTIN_THEME_COLORS, ThemeManager, Theme
 
 
-@pytest.fixture(scope="session")
-def qapp():
-    """Create a QApplication instance for the test session."""
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication([])
-    yield app
+_THEME_MGR = ThemeManager()
 
 
-@pytest.fixture
-def pane(qapp):
-    """Create a fresh EditorPane for each test."""
+def _line_number_qcolors(name):
+    """Parse a built-in theme's line number colors into QColors."""
+    colors = BUILTIN_THEME_COLORS[name]
+    return {
+        "bg": QColor(colors["line_number_bg"]),
+        "text": QColor(colors["line_number_text"]),
+        "current_line": QColor(colors["line_number_current"]),
+    }
+
+
+_THEME_COLORS = {
+    Theme.AQUAMARINE: _line_number_qcolors("Aquamarine"),
+    Theme.MIDNIGHT_BLUE: _line_number_qcolors("Midnight Blue"),
+}
+
+
+def ensure_theme(theme):
+    """Apply a built-in theme unless it is already the current one."""
+    if _THEME_MGR.current_theme != theme:
+        _THEME_MGR.apply_theme(theme)
+
+
+def reset_pane(pane):
+    """Return an EditorPane to its freshly constructed state: no documents."""
+    for doc in pane.documents:
+        pane.remove_document(doc)
+    pane.tab_bar._modified_tabs.clear()
+
+
+def reset_container(container):
+    """Return a SplitContainer to its freshly constructed state: one pane, one new document."""
+    container.merge_panes()
+    pane = container._panes[0]
+    stale = pane.documents
+    pane.add_new_document()
+    for doc in stale:
+        pane.remove_document(doc)
+    pane.tab_bar._modified_tabs.clear()
+    container._active_pane = pane
+
+
+@pytest.fixture(scope="module")
+def shared_pane(qapp):
+    """Create one EditorPane shared by the tests in this module."""
     widget = EditorPane()
-    yield widget
-    widget.deleteLater()
+    widget.setAttribute(Qt.WidgetAttribute.WA_DontShowOnScreen, True)
+    return widget
+
+
+@pytest.fixture
+def pane(shared_pane):
+    """Provide the shared EditorPane with all documents removed."""
+    reset_pane(shared_pane)
+    yield shared_pane
 
 
 @pytest.fixture
-def container(qapp):
-    """Create a fresh SplitContainer for each test."""
+def pane_with_3(pane):
+    """Provide the shared EditorPane holding three new documents, in tab order."""
+    return [pane.add_new_document() for _ in range(3)], pane
+
+
+@pytest.fixture(scope="module")
+def shared_container(qapp):
+    """Create one SplitContainer shared by the tests in this module."""
     widget = SplitContainer()
-    yield widget
-    widget.deleteLater()
+    widget.setAttribute(Qt.WidgetAttribute.WA_DontShowOnScreen, True)
+    return widget
+
+
+@pytest.fixture
+def container(shared_container):
+    """Provide the shared SplitContainer reset to a single pane and document."""
+    reset_container(shared_container)
+    yield shared_container
+
+
+@pytest.fixture
+def split_container(container):
+    """Provide the shared SplitContainer split in two, with the new document moved right."""
+    container.add_new_document()
+    doc = container.active_document
+    container.create_split(doc, "right")
+    return container
 
 
 class TestEditorPaneDocuments:
     """Tests for EditorPane document management."""
     
-    def test_add_document(self, pane):
-        """Can add a document to the pane."""
-        doc = Document(content="Test")
-        pane.add_document(doc)
-        assert doc in pane.documents
-    
-    def test_add_new_document(self, pane):
-        """add_new_document creates and adds a document."""
-        doc = pane.add_new_document()
-        assert doc in pane.documents
-        assert doc.content == ""
-    
-    def test_remove_document(self, pane):
-        """Can remove a document from the pane."""
-        doc = pane.add_new_document()
-        pane.add_new_document()
-        result = pane.remove_document(doc)
-        assert result is True
-        assert doc not in pane.documents
-    
-    def test_remove_nonexistent_document(self, pane):
-        """Removing nonexistent document returns False."""
-        doc = Document()
-        result = pane.remove_document(doc)
-        assert result is False
-    
-    def test_document_count(self, pane):
-        """document_count reflects number of documents."""
+    def test_document_lifecycle(self, pane):
+        """Documents can be added, looked up, inserted and removed."""
         assert pane.document_count == 0
-        pane.add_new_document()
+        
+        # add_document adds an existing document
+        added = Document(content="Test")
+        pane.add_document(added)
+        assert added in pane.documents
         assert pane.document_count == 1
-        pane.add_new_document()
-        assert pane.document_count == 2
-    
-    def test_get_document_at(self, pane):
-        """Can get document by index."""
+        
+        # add_new_document creates, adds and activates an empty document
         doc1 = pane.add_new_document()
+        assert doc1 in pane.documents
+        assert doc1.content == ""
+        assert pane.document_count == 2
+        assert pane.current_document == doc1
+        
         doc2 = pane.add_new_document()
-        assert pane.get_document_at(0) == doc1
-        assert pane.get_document_at(1) == doc2
-    
-    def test_get_document_at_invalid_index(self, pane):
-        """get_document_at returns None for invalid index."""
-        pane.add_new_document()
+        assert pane.document_count == 3
+        assert pane.current_document == doc2
+        
+        # Documents are looked up by tab index
+        assert pane.get_document_at(0) == added
+        assert pane.get_document_at(1) == doc1
+        assert pane.get_document_at(2) == doc2
         assert pane.get_document_at(5) is None
         assert pane.get_document_at(-1) is None
+        
+        # insert_document places a document at a specific position
+        inserted = Document(content="Inserted")
+        pane.insert_document(1, inserted)
+        assert pane.get_document_at(1) == inserted
+        
+        # Removing documents, down to an empty pane
+        for doc in (inserted, added, doc1, doc2):
+            assert pane.remove_document(doc) is True
+            assert doc not in pane.documents
+        assert pane.document_count == 0
     
-    def test_current_document(self, pane):
-        """current_document returns the active document."""
-        doc1 = pane.add_new_document()
-        doc2 = pane.add_new_document()
-        assert pane.current_document == doc2
-    
-    def test_insert_document(self, pane):
-        """Can insert document at specific position."""
-        doc1 = pane.add_new_document()
-        doc2 = pane.add_new_document()
-        doc3 = Document(content="Inserted")
-        pane.insert_document(1, doc3)
-        assert pane.get_document_at(1) == doc3
+    def test_remove_nonexistent_document(self, pane):
+        """Removing nonexistent document returns False."""
+        doc = Document()
+        result = pane.remove_document(doc)
+        assert result is False
 
 
 class TestEditorPaneState:
@@ -119,12 +168,13 @@ class TestEditorPaneState:
         """Tab title updates when document changes."""
         doc = Document(file_path="/test/file.txt")
         pane.add_document(doc)
-        assert pane.tab_bar.tabText(0) == "file.txt"
+        tab_bar = pane.tab_bar
+        assert tab_bar.tabText(0) == "file.txt"
         
         doc.is_modified = True
         pane.update_tab_title(doc)
-        assert pane.tab_bar.tabText(0) == "file.txt"
-        assert 0 in pane.tab_bar._modified_tabs
+        assert tab_bar.tabText(0) == "file.txt"
+        assert 0 in tab_bar._modified_tabs
 
 
 class TestSplitContainer:
@@ -189,64 +239,48 @@ class TestSplitContainerSplit:
         assert doc2 not in original_pane.documents
         assert container.is_split is True
     
-    def test_cannot_split_twice(self, container):
+    def test_cannot_split_twice(self, split_container):
         """Cannot create more than one split."""
-        container.add_new_document()
-        doc1 = container.active_document
-        container.create_split(doc1, "right")
-        
-        container.add_new_document()
-        doc2 = container.active_document
-        container.create_split(doc2, "left")
+        split_container.add_new_document()
+        doc = split_container.active_document
+        split_container.create_split(doc, "left")
         
-        assert len(container._panes) == 2
+        assert len(split_container._panes) == 2
 
 
 class TestSplitContainerMerge:
     """Tests for merge functionality."""
     
-    def test_merge_combines_panes(self, container):
+    def test_merge_combines_panes(self, split_container):
         """Merging combines documents into one pane."""
-        container.add_new_document()
-        doc = container.active_document
-        container.create_split(doc, "right")
-        
-        assert container.is_split is True
+        assert split_container.is_split is True
         
-        container.merge_panes()
+        split_container.merge_panes()
         
-        assert container.is_split is False
-        assert len(container._panes) == 1
+        assert split_container.is_split is False
+        assert len(split_container._panes) == 1
     
-    def test_merge_preserves_documents(self, container):
+    def test_merge_preserves_documents(self, split_container):
         """Merging preserves all documents."""
-        doc1 = container.active_document
-        doc2 = container.add_new_document()
-        container.create_split(doc2, "right")
-        
-        all_docs_before = container.all_documents
-        container.merge_panes()
-        all_docs_after = container.all_documents
+        all_docs_before = split_container.all_documents
+        split_container.merge_panes()
+        all_docs_after = split_container.all_documents
         
-        assert set(all_docs_before) == set(all_docs_after)
+        assert sorted(all_docs_before, key=id) == sorted(all_docs_after, key=id)
 
 
 class TestDocumentTransfer:
     """Tests for document transfer between panes."""
     
-    def test_transfer_document(self, container):
+    def test_transfer_document(self, split_container):
         """Can transfer document between panes."""
-        container.add_new_document()
-        doc = container.active_document
-        container.create_split(doc, "right")
-        
-        source_pane = container.active_pane
-        target_pane = [p for p in container._panes if p != source_pane][0]
+        source_pane = split_container.active_pane
+        target_pane = [p for p in split_container._panes if p != source_pane][0]
         
         source_pane.add_new_document()
         doc_to_transfer = source_pane.current_document
         
-        container.transfer_document(doc_to_transfer, source_pane, target_pane)
+        split_container.transfer_document(doc_to_transfer, source_pane, target_pane)
         
         assert doc_to_transfer not in source_pane.documents
         assert doc_to_transfer in target_pane.documents
@@ -255,11 +289,9 @@ class TestDocumentTransfer:
 class TestTabReordering:
     """Tests for tab reordering behavior."""
     
-    def test_reorder_preserves_documents(self, pane):
+    def test_reorder_preserves_documents(self, pane_with_3):
         """Reordering tabs preserves document objects."""
-        doc1 = pane.add_new_document()
-        doc2 = pane.add_new_document()
-        doc3 = pane.add_new_document()
+        (doc1, doc2, doc3), pane = pane_with_3
         
         pane._on_tab_moved(0, 2)
         
@@ -267,11 +299,9 @@ class TestTabReordering:
         assert doc2 in pane.documents
         assert doc3 in pane.documents
     
-    def test_reorder_updates_order(self, pane):
+    def test_reorder_updates_order(self, pane_with_3):
         """Reordering tabs updates document order."""
-        doc1 = pane.add_new_document()
-        doc2 = pane.add_new_document()
-        doc3 = pane.add_new_document()
+        (doc1, doc2, doc3), pane = pane_with_3
         
         pane._on_tab_moved(0, 2)
         
@@ -281,19 +311,13 @@ class TestTabReordering:
 class TestSwapPanes:
     """Tests for swap panes functionality."""
     
-    def test_swap_reverses_pane_order(self, container):
+    def test_swap_reverses_pane_order(self, split_container):
         """Swapping panes reverses their order."""
-        container.add_new_document()
-        doc = container.active_document
-        container.create_split(doc, "right")
-        
-        left_pane_before = container._panes[0]
-        right_pane_before = container._panes[1]
+        left_pane_before, right_pane_before = split_container._panes
         
-        container.swap_panes()
+        split_container.swap_panes()
         
-        assert container._panes[0] == right_pane_before
-        assert container._panes[1] == left_pane_before
+        assert split_container._panes == [right_pane_before, left_pane_before]
     
     def test_swap_does_nothing_without_split(self, container):
         """Swapping without split does nothing."""
@@ -305,9 +329,10 @@ class TestSwapPanes:
 class TestSplitLineNumberColors:
     """Tests for line number colors in split panes."""
     
-    def test_split_pane_gets_theme_colors(self, container):
-        """New pane from split gets current theme line number colors."""
-        ThemeManager().apply_theme(Theme.AQUAMARINE)
+    @pytest.mark.parametrize("theme", list(_THEME_COLORS))
+    def test_split_pane_gets_theme_colors(self, container, theme):
+        """New pane from split gets the current theme's line number colors."""
+        ensure_theme(theme)
         
         container.add_new_document()
         doc = container.active_document
@@ -316,106 +341,59 @@ class TestSplitLineNumberColors:
         new_pane = container.active_pane
         editor = new_pane._editor
         
-        expected_colors = ThemeManager().get_line_number_colors()
-        from PySide6.QtGui import QColor
-        assert editor._bg_color == QColor(expected_colors["bg"])
-        assert editor._text_color == QColor(expected_colors["text"])
-        assert editor._current_line_color == QColor(expected_colors["current_line"])
-    
-    def test_split_pane_colors_for_midnight_blue(self, container):
-        """New pane from split gets midnight blue theme colors."""
-        ThemeManager().apply_theme(Theme.MIDNIGHT_BLUE)
-        
-        container.add_new_document()
-        doc = container.active_document
-        container.create_split(doc, "right")
-        
-        new_pane = container.active_pane
-        editor = new_pane._editor
-        
-        expected_colors = ThemeManager().get_line_number_colors()
-        from PySide6.QtGui import QColor
-        assert editor._bg_color == QColor(expected_colors["bg"])
+        expected_colors = _THEME_COLORS[theme]
+        assert editor._bg_color == expected_colors["bg"]
+        assert editor._text_color == expected_colors["text"]
+        assert editor._current_line_color == expected_colors["current_line"]
 
 
 class TestUndoRedoModifiedState:
     """Tests for undo/redo affecting is_modified state."""
     
-    def test_undo_reverts_modified_state(self, pane):
-        """Undoing all changes sets is_modified back to false."""
+    def test_undo_redo_state_machine(self, pane):
+        """is_modified and the tab indicator follow undo, redo and save."""
         doc = pane.add_new_document()
+        editor = pane._editor
+        modified_tabs = pane.tab_bar._modified_tabs
+        index = pane.documents.index(doc)
         
         # Start clean
         assert doc.is_modified is False
         
-        # Add some text
-        pane._editor.insertPlainText("Hello, World!")
+        # Undoing a change reverts to clean; redoing it marks modified again
+        editor.insertPlainText("Hello")
         assert doc.is_modified is True
-        
-        # Undo the change
-        pane._editor.undo()
+        editor.undo()
         assert doc.is_modified is False
-    
-    def test_redo_marks_as_modified(self, pane):
-        """Redoing changes sets is_modified back to true."""
-        doc = pane.add_new_document()
-        
-        # Add and undo
-        pane._editor.insertPlainText("Hello")
-        pane._editor.undo()
-        assert doc.is_modified is False
-        
-        # Redo
-        pane._editor.redo()
+        editor.redo()
         assert doc.is_modified is True
-    
-    def test_multiple_changes_then_undo_all(self, pane):
-        """Multiple changes can be undone back to clean state."""
-        doc = pane.add_new_document()
+        editor.undo()
+        assert doc.is_modified is False
         
-        pane._editor.insertPlainText("Line 1\n")
+        # Multiple changes can be undone back to clean state
+        editor.insertPlainText("Line 1\n")
         assert doc.is_modified is True
-        
-        pane._editor.insertPlainText("Line 2")
+        editor.insertPlainText("Line 2")
         assert doc.is_modified is True
-        
-        # Undo both changes
-        pane._editor.undo()
-        pane._editor.undo()
+        editor.undo()
+        editor.undo()
         assert doc.is_modified is False
-    
-    def test_tab_indicator_updates_on_undo(self, pane):
-        """Tab modification indicator updates when undoing."""
-        doc = pane.add_new_document()
         
-        pane._editor.insertPlainText("Test")
+        # Tab modification indicator follows the undo
+        editor.insertPlainText("Test")
         pane.update_tab_title(doc)
-        # Check that the tab shows modified state
-        assert doc.is_modified is True
-        
-        pane._editor.undo()
-        # After undo, is_modified should be False
+        assert index in modified_tabs
+        editor.undo()
         assert doc.is_modified is False
         pane.update_tab_title(doc)
-        # Tab bar should now show the document as unmodified
-        assert doc.is_modified is False
-    
-    def test_restored_doc_tracks_undo_state_correctly(self, pane):
-        """Undoing changes on a document updates is_modified correctly."""
-        doc = pane.add_new_document()
+        assert index not in modified_tabs
         
-        # Add text
-        pane._editor.insertPlainText("Content")
+        # Undo reverts to the saved state after mark_saved
+        editor.insertPlainText("Content")
         assert doc.is_modified is True
-        
-        # Mark as saved to reset is_modified
         doc.mark_saved()
         assert doc.is_modified is False
-        
-        # Add more text
-        pane._editor.insertPlainText(" more")
+        editor.insertPlainText(" more")
         assert doc.is_modified is True
-        
-        # Undo should revert to saved state
-        pane._editor.undo()
+        editor.undo()
         assert doc.is_modified is False
@@ -3,24 +3,15 @@ Tests for the ThemeManager module.
 """
 
 import pytest
-from PySide6.QtWidgets import QApplication
 
 from editor.theme_manager import (
     ThemeManager, Theme, 
     DARK_STYLESHEET, LIGHT_STYLESHEET,
-    AQUAMARINE_STYLESHEET, MIDNIGHT_BLUE_STYLESHEET
+    AQUAMARINE_STYLESHEET, MIDNIGHT_BLUE_STYLESHEET,
+    compact_stylesheet
 )
 
 
-@pytest.fixture(scope="session")
-def qapp():
-    """Create a QApplication instance for the test session."""
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication([])
-    yield app
-
-
 @pytest.fixture
 def theme_manager(qapp):
     """Create a fresh ThemeManager for each test."""
@@ -88,6 +79,19 @@ class TestThemeManager:
         """Can apply midnight blue theme."""
         theme_manager.apply_theme(Theme.MIDNIGHT_BLUE)
         assert theme_manager.current_theme == Theme.MIDNIGHT_BLUE
+    
+    def test_apply_theme_sets_app_stylesheet(self, theme_manager, qapp):
+        """Applying a theme installs its stylesheet on the application."""
+        theme_manager.apply_theme(Theme.DARK)
+        assert "QMainWindow" in qapp.styleSheet()
+    
+    def test_reapply_same_theme_skips_stylesheet(self, theme_manager, qapp, monkeypatch):
+        """Re-applying the active theme does not re-set the stylesheet."""
+        theme_manager.apply_theme(Theme.LIGHT)
+        calls = []
+        monkeypatch.setattr(qapp, "setStyleSheet", lambda s: calls.append(s))
+        theme_manager.apply_theme(Theme.LIGHT)
+        assert calls == []
 
 
 class TestStylesheets:
@@ -144,3 +148,8 @@ class TestStylesheets:
         """Midnight Blue stylesheet has bright accent colors."""
         assert "#58a6ff" in MIDNIGHT_BLUE_STYLESHEET
         assert "#f85149" in MIDNIGHT_BLUE_STYLESHEET
+    
+    def test_compact_stylesheet_collapses_whitespace(self):
+        """Compacting a stylesheet collapses whitespace runs."""
+        compacted = compact_stylesheet("\nQWidget {\n    color: #ffffff;\n}\n")
+        assert compacted == "QWidget { color: #ffffff; }"